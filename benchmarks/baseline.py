@@ -0,0 +1,52 @@
+"""
+Порівняння результатів бенчмарків з базовими.
+
+Модуль не залежить від effortless і pyautogui, тому його можна імпортувати
+(і тестувати) на будь-якій машині.
+"""
+from typing import Dict, List
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    min_delta_ms: float = 0.5,
+    accuracy_drop: float = 0.02
+) -> List[str]:
+    """
+    Порівнює результати з базовими та повертає список регресій.
+
+    Регресією вважається:
+    - медіана, що більша за базову більш ніж на `tolerance` (частка) і водночас
+      більш ніж на `min_delta_ms`, щоб не реагувати на шум у дуже швидких метриках;
+    - поле `accuracy` (наприклад, у OCR), що впало більш ніж на `accuracy_drop`;
+    - метрика, яка є в базових результатах, але відсутня в поточних (наприклад,
+      OCR без встановленого Tesseract), щоб вона не зникала з порівняння непомітно.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): Поточні результати.
+        baseline (Dict[str, Dict[str, float]]): Базові результати.
+        tolerance (float): Допустиме відносне погіршення медіани (0.2 = 20%).
+        min_delta_ms (float): Мінімальна абсолютна різниця медіани в мілісекундах.
+        accuracy_drop (float): Допустиме абсолютне падіння точності (0.02 = 2 п.п.).
+
+    Returns:
+        List[str]: Описи регресій; порожній список, якщо регресій немає.
+    """
+    regressions = [
+        f"{name}: є в базових результатах, але відсутня в поточному запуску"
+        for name in sorted(baseline) if name not in results
+    ]
+    for name, current in sorted(results.items()):
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["median_ms"], current["median_ms"]
+        if new > old * (1 + tolerance) and new - old > min_delta_ms:
+            growth = f"+{(new / old - 1) * 100:.1f}%" if old else "з нуля"
+            regressions.append(f"{name}: {old:.3f} ms -> {new:.3f} ms ({growth})")
+
+        old_accuracy, new_accuracy = baseline[name].get("accuracy"), current.get("accuracy")
+        if old_accuracy is not None and (new_accuracy is None or new_accuracy < old_accuracy - accuracy_drop):
+            regressions.append(f"{name}: точність {old_accuracy} -> {new_accuracy}")
+    return regressions
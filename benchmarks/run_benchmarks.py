@@ -0,0 +1,367 @@
+"""
+Бенчмарки Effortless без захоплення екрану.
+
+Вимірює:
+- затримку пошуку шаблону (`ImageSearcher._find_image_on_screen`) на синтетичних екранах;
+- затримку пошуку в кількох масштабах: повний перебір (паралельний і послідовний)
+  і пошук у запам'ятованому масштабі;
+- пропускну здатність попередньої обробки (`TextExtractor._process_image`);
+- затримку OCR одного поля з цифрами (якщо встановлено Tesseract);
+- точність планування `random_delay` (перевищення запланованої затримки).
+
+Приклади:
+    python benchmarks/run_benchmarks.py --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline import compare  # noqa: E402
+from synthetic import DEFAULT_RESOLUTIONS, SyntheticScreen, make_screen, make_screens, make_template  # noqa: E402
+
+
+def _ensure_headless_pyautogui() -> None:
+    """
+    Дозволяє імпортувати effortless без дисплея.
+
+    pyautogui під Linux без X-сервера (DISPLAY не задано) падає вже під час імпорту.
+    Бенчмарки не захоплюють екран і не рухають мишею, тому лише в цьому випадку
+    підставляємо порожній модуль, будь-яке звернення до якого одразу дає помилку.
+    Якщо дисплей є, pyautogui імпортується як звичайно, і його відсутність чи
+    поломка не приховуються.
+    """
+    if not sys.platform.startswith("linux") or os.environ.get("DISPLAY"):
+        return
+
+    def _unavailable(name: str):
+        raise RuntimeError(f"pyautogui.{name} недоступний у headless-бенчмарках")
+
+    module = types.ModuleType("pyautogui")
+    module.__getattr__ = _unavailable
+    sys.modules["pyautogui"] = module
+
+
+_ensure_headless_pyautogui()
+
+from effortless import ImageSearcher, TextExtractor  # noqa: E402
+from effortless.utils.random_delay import generate_random_delay, random_delay  # noqa: E402
+
+
+def _measure(func: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """
+    Виконує функцію кілька разів і повертає час кожного виклику в мілісекундах.
+
+    Args:
+        func (Callable[[], object]): Функція для вимірювання.
+        repeat (int): Кількість вимірювань.
+        warmup (int): Кількість прогрівальних викликів, які не враховуються.
+
+    Returns:
+        List[float]: Тривалості викликів у мілісекундах.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _summary(timings: List[float]) -> Dict[str, float]:
+    """Рахує медіану та 95-й перцентиль для списку вимірювань."""
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(float(np.percentile(timings, 95)), 4),
+    }
+
+
+def bench_match(screens: List[SyntheticScreen], repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Вимірює затримку пошуку шаблону на кожному синтетичному екрані.
+
+    Args:
+        screens (List[SyntheticScreen]): Синтетичні екрани.
+        repeat (int): Кількість вимірювань.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Результати за назвою метрики.
+    """
+    searcher = ImageSearcher()
+    results = {}
+    for screen in screens:
+        screen_gray, template_gray = screen.screen_gray, screen.template_gray
+        found = searcher._find_image_on_screen(template_gray, screen_gray)
+        if found is None or tuple(map(int, found)) != screen.template_pos:
+            raise RuntimeError(
+                f"Шаблон на екрані {screen.resolution} знайдено в {found}, очікувалось {screen.template_pos}"
+            )
+        timings = _measure(lambda: searcher._find_image_on_screen(template_gray, screen_gray), repeat)
+        width, height = screen.resolution
+        results[f"match.{width}x{height}"] = _summary(timings)
+    return results
+
+
+def bench_match_multiscale(
+    resolutions: List[Tuple[int, int]],
+    repeat: int,
+    seed: int = 0,
+    scales: Tuple[float, ...] = (0.75, 1.0, 1.25, 1.5),
+    template_scale: float = 1.25
+) -> Dict[str, Dict[str, float]]:
+    """
+    Вимірює пошук шаблону, вбудованого в екран в іншому масштабі.
+
+    Для кожної роздільної здатності міряється повний перебір масштабів (кеш
+    порожній) — паралельний у потоках і послідовний — та пошук у вже
+    запам'ятованому масштабі.
+
+    Args:
+        resolutions (List[Tuple[int, int]]): Роздільні здатності синтетичних екранів.
+        repeat (int): Кількість вимірювань.
+        seed (int): Зерно генератора синтетичних даних.
+        scales (Tuple[float, ...]): Масштаби для ImageSearcher.
+        template_scale (float): Масштаб, у якому шаблон вбудовано в екран.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Результати за назвою метрики.
+    """
+    searcher = ImageSearcher(scales=list(scales), max_workers=len(scales))
+    sequential = ImageSearcher(scales=list(scales), max_workers=1)
+    template = make_template(seed=seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_path = os.path.join(tmp_dir, "template.png")
+        cv2.imwrite(template_path, template)
+        bank = searcher._load_scale_bank(template_path)
+    results = {}
+    for i, resolution in enumerate(resolutions):
+        screen = make_screen(resolution, template, seed=seed + i, template_scale=template_scale)
+        screen_gray = screen.screen_gray
+        display = (f"bench-{i}", *resolution)
+
+        def sweep() -> Optional[Tuple[int, int]]:
+            searcher.clear_scale_cache()
+            return searcher._find_image_multiscale(bank, screen_gray, display)
+
+        found = sweep()
+        if found is None or searcher._display_scales.get(display) != template_scale:
+            raise RuntimeError(f"Шаблон у масштабі {template_scale} на екрані {resolution} не знайдено: {found}")
+
+        width, height = resolution
+        results[f"match_multiscale.sweep.{width}x{height}"] = _summary(_measure(sweep, repeat))
+
+        def sweep_sequential() -> Optional[Tuple[int, int]]:
+            sequential.clear_scale_cache()
+            return sequential._find_image_multiscale(bank, screen_gray, display)
+
+        results[f"match_multiscale.sweep_sequential.{width}x{height}"] = _summary(_measure(sweep_sequential, repeat))
+        sweep()
+        results[f"match_multiscale.cached.{width}x{height}"] = _summary(
+            _measure(lambda: searcher._find_image_multiscale(bank, screen_gray, display), repeat)
+        )
+    searcher.close()
+    return results
+
+
+def bench_preprocess(screens: List[SyntheticScreen], repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Вимірює попередню обробку полів з цифрами перед OCR.
+
+    Args:
+        screens (List[SyntheticScreen]): Синтетичні екрани.
+        repeat (int): Кількість вимірювань.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Результати за назвою метрики, включно з полями за секунду.
+    """
+    extractor = TextExtractor(tesseract_cmd=shutil.which("tesseract") or "tesseract")
+    fields = _field_images(screens)
+
+    def process_all() -> None:
+        for image in fields:
+            extractor._process_image(image, 2.2, 2.2, 1.3, (2, 2))
+
+    timings = _measure(process_all, repeat)
+    summary = _summary([t / len(fields) for t in timings])
+    summary["fields_per_s"] = round(1000 / summary["median_ms"], 2)
+    return {"preprocess.field": summary}
+
+
+def bench_ocr(screens: List[SyntheticScreen], repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Вимірює затримку OCR одного поля з цифрами (обробка + Tesseract).
+
+    Args:
+        screens (List[SyntheticScreen]): Синтетичні екрани.
+        repeat (int): Кількість вимірювань.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Результати за назвою метрики або порожній словник, якщо Tesseract недоступний.
+    """
+    tesseract_cmd = shutil.which("tesseract")
+    if tesseract_cmd is None:
+        print("Tesseract не знайдено, OCR-бенчмарк пропущено.", file=sys.stderr)
+        return {}
+
+    import pytesseract
+
+    extractor = TextExtractor(tesseract_cmd=tesseract_cmd)
+    config = '--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
+    fields = _field_images(screens)
+    expected = [f.text for screen in screens for f in screen.digit_fields]
+    index = {"i": 0}
+    correct = 0
+
+    def ocr_one() -> str:
+        image = fields[index["i"] % len(fields)]
+        index["i"] += 1
+        processed = extractor._process_image(image, 2.2, 2.2, 1.3, (2, 2))
+        return pytesseract.image_to_string(processed, config=config)
+
+    for image_index, text in enumerate(expected):
+        index["i"] = image_index
+        correct += ocr_one().strip() == text
+
+    index["i"] = 0
+    summary = _summary(_measure(ocr_one, repeat, warmup=0))
+    summary["accuracy"] = round(correct / len(expected), 3)
+    return {"ocr.field": summary}
+
+
+def bench_random_delay(repeat: int, ranges: Tuple[Tuple[float, float], ...] = ((0.0, 0.005), (0.01, 0.02))
+                       ) -> Dict[str, Dict[str, float]]:
+    """
+    Вимірює, наскільки фактична затримка `random_delay` перевищує заплановану.
+
+    Заплановане значення отримуємо з `generate_random_delay` з тим самим seed,
+    тому різниця показує лише похибку планувальника ОС.
+
+    Args:
+        repeat (int): Кількість вимірювань для кожного діапазону.
+        ranges (Tuple[Tuple[float, float], ...]): Діапазони (min_delay, max_delay) у секундах.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Перевищення затримки в мілісекундах за назвою метрики.
+    """
+    results = {}
+    for min_delay, max_delay in ranges:
+        overshoots = []
+        for seed in range(repeat):
+            random.seed(seed)
+            planned = generate_random_delay(min_delay, max_delay)
+            random.seed(seed)
+            start = time.perf_counter()
+            random_delay(min_delay, max_delay)
+            overshoots.append((time.perf_counter() - start - planned) * 1000)
+        results[f"random_delay.{min_delay}-{max_delay}s.overshoot"] = _summary(overshoots)
+    return results
+
+
+def _field_images(screens: List[SyntheticScreen]) -> List[Image.Image]:
+    """Вирізає поля з цифрами у форматі PIL.Image, як їх повертає pyautogui.screenshot."""
+    images = []
+    for screen in screens:
+        rgb = screen.screen_bgr[:, :, ::-1]
+        for digit_field in screen.digit_fields:
+            x, y, w, h = digit_field.cords
+            images.append(Image.fromarray(np.ascontiguousarray(rgb[y:y + h, x:x + w])))
+    return images
+
+
+def run(repeat: int, resolutions: List[Tuple[int, int]], seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Запускає всі бенчмарки.
+
+    Args:
+        repeat (int): Кількість вимірювань для кожної метрики.
+        resolutions (List[Tuple[int, int]]): Роздільні здатності синтетичних екранів.
+        seed (int): Зерно генератора синтетичних даних.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Результати всіх бенчмарків за назвою метрики.
+    """
+    screens = make_screens(resolutions, seed=seed)
+    results = {}
+    results.update(bench_match(screens, repeat))
+    results.update(bench_match_multiscale(resolutions, repeat, seed=seed))
+    results.update(bench_preprocess(screens, repeat))
+    results.update(bench_ocr(screens, repeat))
+    results.update(bench_random_delay(repeat))
+    return results
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    """Розбирає роздільну здатність у форматі ШИРИНАxВИСОТА."""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки Effortless на синтетичних екранах.")
+    parser.add_argument("--repeat", type=int, default=20, help="Кількість вимірювань для кожної метрики.")
+    parser.add_argument("--resolutions", type=_parse_resolution, nargs="+", default=DEFAULT_RESOLUTIONS,
+                        help="Роздільні здатності у форматі ШИРИНАxВИСОТА.")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора синтетичних даних.")
+    parser.add_argument("--output", help="Зберегти результати у JSON-файл.")
+    parser.add_argument("--save-baseline", help="Зберегти результати як базові для порівняння.")
+    parser.add_argument("--compare", help="Порівняти з базовими результатами з JSON-файлу.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Допустиме погіршення медіани (0.2 = 20%%).")
+    parser.add_argument("--accuracy-drop", type=float, default=0.02,
+                        help="Допустиме падіння точності OCR (0.02 = 2 п.п.).")
+    args = parser.parse_args(argv)
+
+    # Логи про кожен знайдений шаблон лише заважають читати результати
+    logging.disable(logging.INFO)
+    results = run(args.repeat, args.resolutions, args.seed)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    for name, summary in sorted(results.items()):
+        extra = ", ".join(f"{k}={v}" for k, v in summary.items() if k not in ("median_ms", "p95_ms"))
+        print(f"{name:<40} median {summary['median_ms']:>10.3f} ms  p95 {summary['p95_ms']:>10.3f} ms  {extra}")
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Результати збережено: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance, accuracy_drop=args.accuracy_drop)
+        if regressions:
+            print("Виявлено регресії:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Регресій не виявлено.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Генерація синтетичних даних для бенчмарків.
+
+Модуль створює відтворювані (за seed) "скріншоти" заданої роздільної здатності
+з вбудованими шаблонами та намальованими полями з цифрами. Дисплей для цього
+не потрібен, тому бенчмарки можна запускати на headless-машинах.
+"""
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+# Роздільні здатності екранів за замовчуванням (ширина, висота)
+DEFAULT_RESOLUTIONS: List[Tuple[int, int]] = [(1280, 720), (1920, 1080), (2560, 1440)]
+
+
+@dataclass
+class DigitField:
+    """Поле з цифрами, намальоване на синтетичному екрані."""
+
+    text: str
+    cords: List[int]  # [x, y, ширина, висота], як у region для pyautogui
+
+
+@dataclass
+class SyntheticScreen:
+    """Синтетичний екран із вбудованим шаблоном та полями з цифрами."""
+
+    screen_bgr: np.ndarray
+    template_bgr: np.ndarray
+    template_pos: Tuple[int, int]
+    digit_fields: List[DigitField] = field(default_factory=list)
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """Роздільна здатність екрану (ширина, висота)."""
+        return self.screen_bgr.shape[1], self.screen_bgr.shape[0]
+
+    @property
+    def screen_gray(self) -> np.ndarray:
+        """Екран у відтінках сірого, як його повертає ImageSearcher._take_screenshot."""
+        return cv2.cvtColor(self.screen_bgr, cv2.COLOR_BGR2GRAY)
+
+    @property
+    def template_gray(self) -> np.ndarray:
+        """Шаблон у відтінках сірого, як його повертає ImageSearcher._load_image."""
+        return cv2.cvtColor(self.template_bgr, cv2.COLOR_BGR2GRAY)
+
+
+def make_template(size: Tuple[int, int] = (64, 48), seed: int = 0) -> np.ndarray:
+    """
+    Створює кнопку-шаблон з контрастними фігурами та підписом.
+
+    Args:
+        size (Tuple[int, int]): Розмір шаблону (ширина, висота).
+        seed (int): Зерно генератора випадкових чисел.
+
+    Returns:
+        np.ndarray: Шаблон у форматі BGR.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    template = np.full((height, width, 3), rng.integers(40, 90, 3), dtype=np.uint8)
+    cv2.rectangle(template, (2, 2), (width - 3, height - 3), (230, 230, 230), 2)
+    cv2.circle(template, (width // 4, height // 2), min(width, height) // 5, (30, 160, 240), -1)
+    cv2.putText(template, "OK", (width // 2 - 4, height // 2 + 8), cv2.FONT_HERSHEY_SIMPLEX,
+                0.6, (255, 255, 255), 2, cv2.LINE_AA)
+    return template
+
+
+def make_screen(
+    resolution: Tuple[int, int],
+    template: np.ndarray,
+    n_digit_fields: int = 4,
+    seed: int = 0,
+    template_scale: float = 1.0
+) -> SyntheticScreen:
+    """
+    Створює синтетичний екран: шумний фон, "вікна"-прямокутники, вбудований шаблон
+    та поля з випадковими числами.
+
+    Args:
+        resolution (Tuple[int, int]): Роздільна здатність екрану (ширина, висота).
+        template (np.ndarray): Шаблон у форматі BGR, який буде вбудовано в екран.
+        n_digit_fields (int): Кількість полів з цифрами.
+        seed (int): Зерно генератора випадкових чисел.
+        template_scale (float): Масштаб, у якому шаблон вбудовується в екран (імітація іншого DPI).
+
+    Returns:
+        SyntheticScreen: Згенерований екран з метаданими.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = resolution
+    screen = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+
+    # Фонові "вікна", щоб matchTemplate мав на що відволікатися
+    for _ in range(12):
+        x1, y1 = int(rng.integers(0, width - 50)), int(rng.integers(0, height - 50))
+        x2, y2 = x1 + int(rng.integers(40, width // 3)), y1 + int(rng.integers(30, height // 3))
+        color = tuple(int(c) for c in rng.integers(60, 200, 3))
+        cv2.rectangle(screen, (x1, y1), (min(x2, width - 1), min(y2, height - 1)), color, -1)
+
+    # Поля з цифрами у верхній смузі екрану (шаблон ставиться нижче)
+    digit_fields = []
+    field_w, field_h = 160, 40
+    for i in range(n_digit_fields):
+        x, y = 20 + i * (field_w + 20), 20
+        text = str(int(rng.integers(0, 10 ** 6)))
+        cv2.rectangle(screen, (x, y), (x + field_w, y + field_h), (20, 20, 20), -1)
+        cv2.putText(screen, text, (x + 8, y + 30), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.9, (240, 240, 240), 2, cv2.LINE_AA)
+        digit_fields.append(DigitField(text=text, cords=[x, y, field_w, field_h]))
+
+    embedded = template
+    if template_scale != 1:
+        embedded = cv2.resize(template, None, fx=template_scale, fy=template_scale, interpolation=cv2.INTER_LINEAR)
+    t_h, t_w = embedded.shape[:2]
+    tx = int(rng.integers(0, width - t_w))
+    ty = int(rng.integers(field_h + 40, height - t_h))
+    screen[ty:ty + t_h, tx:tx + t_w] = embedded
+
+    return SyntheticScreen(
+        screen_bgr=screen,
+        template_bgr=template,
+        template_pos=(tx, ty),
+        digit_fields=digit_fields,
+    )
+
+
+def make_screens(
+    resolutions: List[Tuple[int, int]] = DEFAULT_RESOLUTIONS,
+    seed: int = 0
+) -> List[SyntheticScreen]:
+    """
+    Створює набір синтетичних екранів для кожної роздільної здатності.
+
+    Args:
+        resolutions (List[Tuple[int, int]]): Список роздільних здатностей (ширина, висота).
+        seed (int): Зерно генератора випадкових чисел.
+
+    Returns:
+        List[SyntheticScreen]: Список згенерованих екранів.
+    """
+    template = make_template(seed=seed)
+    return [make_screen(res, template, seed=seed + i) for i, res in enumerate(resolutions)]
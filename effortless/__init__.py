@@ -6,12 +6,30 @@ Effortless — це Python-бібліотека для автоматизаці
 - Робота з мишею.
 - Пошук зображень на екрані.
 - Автоматичне оновлення коду.
+- Паралельний запуск сесій на віртуальних дисплеях.
 """
 
-from .text_extractor import TextExtractor
-from .mouse_controller import MouseController
-from .image_searcher import ImageSearcher
+import importlib
+
+from .session_runner import SessionSupervisor, SessionContext
 from .autoupdater import AutoUpdater, GitUpdater
 from .utils import random_delay, kill_process_by_window_name, send_telegram_message
 
+# Ці класи імпортують pyautogui, який під Linux без DISPLAY падає вже під час імпорту.
+# Тому вони завантажуються лише при першому зверненні, і, наприклад, SessionSupervisor
+# можна використовувати на headless-машині ще до запуску Xvfb.
+_LAZY_IMPORTS = {
+    "TextExtractor": ".text_extractor",
+    "MouseController": ".mouse_controller",
+    "ImageSearcher": ".image_searcher",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __version__ = "0.1.0"
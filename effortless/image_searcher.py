@@ -1,9 +1,12 @@
+import os
 import time
 import pyautogui
 import cv2
 import numpy as np
 import logging
-from typing import Optional, Tuple, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List, Union, Dict
+from .utils.scale_template import scale_template
 
 # Налаштування логування
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -12,16 +15,56 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 class ImageSearcher:
     """Клас для пошуку зображення на екрані."""
 
-    def __init__(self, threshold: float = 0.87, save_screens: bool = False) -> None:
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        save_screens: bool = False,
+        scales: Optional[List[float]] = None,
+        templates: Optional[Dict[str, np.ndarray]] = None,
+        scale_bank: Optional[Dict[str, List[Tuple[float, np.ndarray]]]] = None,
+        max_workers: Optional[int] = None
+    ) -> None:
         """
         Ініціалізація класу.
 
         Args:
             threshold (float): Поріг збігу для пошуку зображення (за замовчуванням 0.87).
             save_screens (bool): Чи зберігати скріншоти під час пошуку (за замовчуванням False).
+            scales (Optional[List[float]]): Масштаби шаблонів для пошуку на екранах з іншою
+                роздільною здатністю або DPI, наприклад [0.75, 1.0, 1.25, 1.5].
+                Якщо None, пошук відбувається лише в оригінальному масштабі.
+            templates (Optional[Dict[str, np.ndarray]]): Заздалегідь завантажені шаблони у відтінках
+                сірого (шлях -> масив), наприклад зі спільної пам'яті. Шаблони, яких тут немає,
+                читаються з диска.
+            scale_bank (Optional[Dict[str, List[Tuple[float, np.ndarray]]]]): Заздалегідь масштабовані
+                шаблони (шлях -> [(масштаб, масив), ...]), наприклад зі спільної пам'яті. Для шаблонів,
+                яких тут немає, масштаби обчислюються при першому пошуку.
+            max_workers (Optional[int]): Кількість потоків для перебору масштабів. Якщо None,
+                min(кількість масштабів, кількість ядер CPU); 1 — послідовний перебір без потоків.
         """
         self.threshold = threshold
         self.save_screens = save_screens
+        self.scales = sorted(set(scales)) if scales else None
+        self.templates = templates or {}
+        # Банк масштабованих шаблонів: шлях до зображення -> [(масштаб, шаблон), ...]
+        self._scale_bank: Dict[str, List[Tuple[float, np.ndarray]]] = dict(scale_bank or {})
+        # Масштаб, який спрацював на дисплеї: (DISPLAY, ширина, висота) -> масштаб
+        self._display_scales: Dict[Tuple[str, int, int], float] = {}
+        # Потоки для паралельного перебору масштабів, створюються при першому переборі
+        self.max_workers = max_workers or min(len(self.scales or [1]), os.cpu_count() or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "ImageSearcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Зупиняє потоки перебору масштабів. Після цього об'єкт можна використовувати далі."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def search_image(
         self,
@@ -40,15 +83,24 @@ class ImageSearcher:
         Returns:
             Union[bool, Tuple[int, int]]: Координати знайденого зображення (x, y) або False, якщо зображення не знайдено.
         """
-        img_gray = self._load_image(img)
-        if img_gray is None:
-            return False
+        if self.scales:
+            bank = self._load_scale_bank(img)
+            if bank is None:
+                return False
+            display = self._display_key()
+        else:
+            img_gray = self._load_image(img)
+            if img_gray is None:
+                return False
 
         start_time = time.time()
         logging.info(f"Зображення {img} почали шукати")
         while True:
             screen_gray = self._take_screenshot(cords)
-            result = self._find_image_on_screen(img_gray, screen_gray, cords)
+            if self.scales:
+                result = self._find_image_multiscale(bank, screen_gray, display, cords)
+            else:
+                result = self._find_image_on_screen(img_gray, screen_gray, cords)
 
             if result:
                 if self.save_screens:
@@ -80,6 +132,15 @@ class ImageSearcher:
         """
         return self.search_image(img, cords, search_time=0)
 
+    def clear_scale_cache(self) -> None:
+        """
+        Скидає запам'ятовані масштаби дисплеїв.
+
+        Після цього наступний пошук знову перебере всі масштаби. Корисно, якщо
+        змінилась роздільна здатність або DPI дисплея.
+        """
+        self._display_scales.clear()
+
     def _load_image(self, img: str) -> Optional[np.ndarray]:
         """
         Завантажує зображення та конвертує його у відтінки сірого.
@@ -90,12 +151,52 @@ class ImageSearcher:
         Returns:
             Optional[np.ndarray]: Зображення у відтінках сірого або None, якщо зображення не знайдено.
         """
+        if img in self.templates:
+            return self.templates[img]
         img_rgb = cv2.imread(img)
         if img_rgb is None:
             logging.error(f"Зображення {img} не знайдено.")
             return None
         return cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
 
+    def _load_scale_bank(self, img: str) -> Optional[List[Tuple[float, np.ndarray]]]:
+        """
+        Повертає шаблон у всіх масштабах з self.scales, обчислюючи їх лише один раз.
+
+        Args:
+            img (str): Шлях до зображення.
+
+        Returns:
+            Optional[List[Tuple[float, np.ndarray]]]: Список (масштаб, шаблон) або None, якщо зображення не знайдено.
+        """
+        if img in self._scale_bank:
+            return self._scale_bank[img]
+
+        img_gray = self._load_image(img)
+        if img_gray is None:
+            return None
+
+        bank = []
+        for scale in self.scales:
+            scaled = scale_template(img_gray, scale)
+            if scaled is None:
+                logging.warning(f"Масштаб {scale} для зображення {img} пропущено: розмір шаблону стає нульовим.")
+                continue
+            bank.append((scale, scaled))
+        self._scale_bank[img] = bank
+        return bank
+
+    @staticmethod
+    def _display_key() -> Tuple[str, int, int]:
+        """
+        Ідентифікує поточний дисплей за змінною DISPLAY та його роздільною здатністю.
+
+        Returns:
+            Tuple[str, int, int]: Ключ дисплея (DISPLAY, ширина, висота).
+        """
+        width, height = pyautogui.size()
+        return os.environ.get("DISPLAY", ""), int(width), int(height)
+
     def _take_screenshot(self, cords: Optional[List[int]] = None) -> np.ndarray:
         """
         Робить скріншот вказаної області або всього екрану.
@@ -139,6 +240,83 @@ class ImageSearcher:
             return x, y
         return None
 
+    def _find_image_multiscale(
+        self,
+        bank: List[Tuple[float, np.ndarray]],
+        screen_gray: np.ndarray,
+        display: Tuple[str, int, int],
+        cords: Optional[List[int]] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Шукає зображення на скріншоті в кількох масштабах.
+
+        Якщо для дисплея вже відомий масштаб і він є в bank, перевіряється лише він.
+        Інакше перебираються всі масштаби (у max_workers потоках), а масштаб найкращого збігу
+        запам'ятовується для дисплея, якщо його ще не було.
+
+        Args:
+            bank (List[Tuple[float, np.ndarray]]): Шаблон у різних масштабах.
+            screen_gray (np.ndarray): Скріншот екрану (у відтінках сірого).
+            display (Tuple[str, int, int]): Ключ дисплея.
+            cords (Optional[List[int]]): Координати області пошуку [x1, y1, x2, y2].
+
+        Returns:
+            Optional[Tuple[int, int]]: Координати знайденого зображення (x, y) або None, якщо зображення не знайдено.
+        """
+        known_scale = self._display_scales.get(display)
+        candidates = [(scale, template) for scale, template in bank if scale == known_scale]
+        if not candidates:
+            # Масштаб ще невідомий або для цього шаблону його пропущено — повний перебір
+            candidates = bank
+        if not candidates:
+            return None
+
+        if len(candidates) == 1 or self.max_workers <= 1:
+            matches = [self._match_scale(candidate, screen_gray) for candidate in candidates]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            matches = list(self._executor.map(lambda c: self._match_scale(c, screen_gray), candidates))
+
+        matches = [m for m in matches if m is not None]
+        if not matches:
+            return None
+
+        score, scale, (x, y) = max(matches, key=lambda m: m[0])
+        if score < self.threshold:
+            return None
+
+        if known_scale is None:
+            logging.info(f"Для дисплея {display} обрано масштаб {scale}")
+            self._display_scales[display] = scale
+        x = x + cords[0] if cords else x
+        y = y + cords[1] if cords else y
+        logging.info(f"Зображення знайдено: координати: ({x}, {y}), масштаб: {scale}")
+        return x, y
+
+    @staticmethod
+    def _match_scale(
+        candidate: Tuple[float, np.ndarray],
+        screen_gray: np.ndarray
+    ) -> Optional[Tuple[float, float, Tuple[int, int]]]:
+        """
+        Шукає на скріншоті шаблон одного масштабу.
+
+        Args:
+            candidate (Tuple[float, np.ndarray]): Масштаб і шаблон у цьому масштабі.
+            screen_gray (np.ndarray): Скріншот екрану (у відтінках сірого).
+
+        Returns:
+            Optional[Tuple[float, float, Tuple[int, int]]]: (оцінка збігу, масштаб, (x, y)) або None,
+            якщо шаблон більший за скріншот.
+        """
+        scale, template = candidate
+        if template.shape[0] > screen_gray.shape[0] or template.shape[1] > screen_gray.shape[1]:
+            return None
+        res = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return max_val, scale, max_loc
+
     def _save_screenshot(self, screen_gray: np.ndarray, path: str) -> None:
         """
         Зберігає скріншот на диск.
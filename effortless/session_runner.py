@@ -0,0 +1,548 @@
+"""
+Модуль для паралельного запуску кількох сесій автоматизації на одній машині.
+
+Цей модуль надає клас `SessionSupervisor`, який дозволяє:
+- Запускати N сесій в окремих процесах, кожну на власному віртуальному дисплеї Xvfb.
+- Один раз завантажувати шаблони та ділитися ними між сесіями через спільну пам'ять.
+- Збирати статистику CPU та затримок для кожної сесії.
+
+Кожна сесія отримує `SessionContext` зі своїм `ImageSearcher` та `MouseController`,
+які працюють лише з дисплеєм цієї сесії. Вони (і pyautogui) імпортуються лише в
+процесі сесії, тому сам супервізор працює на машині без дисплея.
+"""
+import gc
+import os
+import time
+import queue
+import weakref
+import signal
+import logging
+import statistics
+import subprocess
+import threading
+import multiprocessing as mp
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+import psutil
+
+from .utils.scale_template import scale_template
+
+if TYPE_CHECKING:
+    from .image_searcher import ImageSearcher
+    from .mouse_controller import MouseController
+
+# Налаштування логування
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# DISPLAY успадковується дочірнім процесом під час старту, тому старт сесій
+# (тимчасова зміна os.environ) має бути послідовним.
+_start_lock = threading.Lock()
+
+# Опис шаблонів у спільній пам'яті: (шлях, масштаб) -> (зміщення, форма)
+TemplateManifest = Dict[Tuple[str, float], Tuple[int, Tuple[int, ...]]]
+
+
+@dataclass
+class SessionStats:
+    """Статистика однієї сесії."""
+
+    index: int
+    display: str
+    exitcode: Optional[int] = None
+    # Час CPU процесу сесії разом з дочірніми процесами (наприклад, tesseract)
+    cpu_time: float = 0.0
+    xvfb_cpu_time: float = 0.0
+    latencies: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class SessionContext:
+    """Контекст сесії, який отримує функція сесії в дочірньому процесі."""
+
+    def __init__(
+        self,
+        index: int,
+        display: str,
+        templates: Dict[str, np.ndarray],
+        scale_bank: Dict[str, List[Tuple[float, np.ndarray]]],
+        searcher_kwargs: Dict[str, Any]
+    ) -> None:
+        """
+        Ініціалізація контексту.
+
+        Args:
+            index (int): Номер сесії.
+            display (str): Віртуальний дисплей сесії (наприклад, ':99').
+            templates (Dict[str, np.ndarray]): Спільні шаблони лише для читання в оригінальному масштабі (шлях -> масив).
+            scale_bank (Dict[str, List[Tuple[float, np.ndarray]]]): Спільні масштабовані шаблони для ImageSearcher.
+            searcher_kwargs (Dict[str, Any]): Параметри ImageSearcher.
+        """
+        self.index = index
+        self.display = display
+        self.templates = templates
+        self.scale_bank = scale_bank
+        self.searcher_kwargs = searcher_kwargs
+        self._searcher: Optional["ImageSearcher"] = None
+        self._latencies: Dict[str, List[float]] = {}
+
+    @property
+    def searcher(self) -> "ImageSearcher":
+        """Пошук зображень на дисплеї сесії; створюється (разом з імпортом pyautogui) при першому зверненні."""
+        if self._searcher is None:
+            from .image_searcher import ImageSearcher
+
+            scales = self.searcher_kwargs.get("scales")
+            scale_bank = {
+                path: [(scale, image) for scale, image in bank if scale in scales]
+                for path, bank in self.scale_bank.items()
+            } if scales else {}
+            self._searcher = ImageSearcher(templates=self.templates, scale_bank=scale_bank, **self.searcher_kwargs)
+        return self._searcher
+
+    @property
+    def mouse(self) -> Type["MouseController"]:
+        """Керування мишею на дисплеї сесії; pyautogui імпортується при першому зверненні."""
+        from .mouse_controller import MouseController
+
+        return MouseController
+
+    def release_templates(self) -> None:
+        """Відпускає посилання на масиви у спільній пам'яті, щоб її можна було закрити."""
+        if self._searcher is not None:
+            self._searcher.close()
+            self._searcher.templates = {}
+            self._searcher._scale_bank = {}
+        self.templates = {}
+        self.scale_bank = {}
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """
+        Вимірює тривалість блоку коду та додає її до статистики сесії.
+
+        Args:
+            name (str): Назва операції у статистиці.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._latencies.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Підсумовує виміряні затримки.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Для кожної операції: кількість, медіана, p95 та максимум у мілісекундах.
+        """
+        return {
+            name: {
+                "count": len(timings),
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(float(np.percentile(timings, 95)), 3),
+                "max_ms": round(max(timings), 3),
+            }
+            for name, timings in self._latencies.items()
+        }
+
+
+class SessionSupervisor:
+    """Клас для запуску кількох сесій на окремих віртуальних дисплеях."""
+
+    def __init__(
+        self,
+        target: Callable[[SessionContext], Any],
+        sessions: int,
+        templates: Optional[List[str]] = None,
+        screen_size: Tuple[int, int] = (1920, 1080),
+        first_display: int = 99,
+        xvfb_cmd: str = "Xvfb",
+        xvfb_timeout: float = 10,
+        threshold: float = 0.87,
+        scales: Optional[List[float]] = None
+    ) -> None:
+        """
+        Ініціалізація класу.
+
+        Args:
+            target (Callable[[SessionContext], Any]): Функція сесії. Має бути визначена на рівні модуля,
+                бо передається в дочірній процес.
+            sessions (int): Кількість сесій.
+            templates (Optional[List[str]]): Шляхи до шаблонів, які завантажуються один раз
+                і розділяються між сесіями через спільну пам'ять (разом з усіма масштабами з scales).
+            screen_size (Tuple[int, int]): Роздільна здатність віртуальних дисплеїв (ширина, висота).
+            first_display (int): Номер, з якого шукаються вільні дисплеї.
+            xvfb_cmd (str): Шлях до виконуваного файлу Xvfb.
+            xvfb_timeout (float): Час очікування запуску Xvfb у секундах.
+            threshold (float): Поріг збігу для ImageSearcher кожної сесії.
+            scales (Optional[List[float]]): Масштаби для ImageSearcher кожної сесії.
+        """
+        if sessions < 1:
+            raise ValueError("Кількість сесій повинна бути додатною.")
+
+        self.target = target
+        self.sessions = sessions
+        self.templates = templates or []
+        self.screen_size = screen_size
+        self.first_display = first_display
+        self.xvfb_cmd = xvfb_cmd
+        self.xvfb_timeout = xvfb_timeout
+        self.searcher_kwargs = {"threshold": threshold, "scales": scales}
+
+        self._ctx = mp.get_context("spawn")
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._xvfb: List[subprocess.Popen] = []
+        self._processes: List[mp.process.BaseProcess] = []
+        self._reset()
+
+    def __enter__(self) -> "SessionSupervisor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def run(self) -> List[SessionStats]:
+        """
+        Запускає всі сесії, чекає на їх завершення та звільняє ресурси.
+
+        Returns:
+            List[SessionStats]: Статистика кожної сесії.
+        """
+        with self:
+            return self.join()
+
+    def start(self) -> None:
+        """
+        Завантажує шаблони у спільну пам'ять, запускає дисплеї Xvfb та процеси сесій.
+
+        Raises:
+            RuntimeError: Якщо попередній запуск ще не зупинено через stop().
+        """
+        self._reset()
+        try:
+            self._share_templates()
+            display_number = self.first_display
+            for index in range(self.sessions):
+                display_number = self._free_display(display_number)
+                display = f":{display_number}"
+                self._start_xvfb(display_number)
+                self._start_session(index, display)
+                display_number += 1
+        except Exception:
+            self.stop()
+            raise
+
+    def join(self, timeout: Optional[float] = None) -> List[SessionStats]:
+        """
+        Чекає на завершення сесій і збирає їх статистику.
+
+        Args:
+            timeout (Optional[float]): Максимальний час очікування в секундах. Якщо None, чекає без обмежень.
+                Сесії, що не завершились вчасно, отримують помилку про тайм-аут і час CPU на момент перевірки;
+                зупинити їх можна через stop().
+
+        Returns:
+            List[SessionStats]: Статистика кожної сесії в порядку запуску.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        stats = {
+            index: SessionStats(index=index, display=display)
+            for index, display in enumerate(self._displays)
+        }
+        pending = set(stats)
+        crashed = set()
+
+        while pending:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                logger.warning(f"Сесії {sorted(pending)} не завершились вчасно.")
+                break
+            try:
+                index, cpu_time, latencies, error = self._results.get(
+                    timeout=1 if remaining is None else min(remaining, 1)
+                )
+            except queue.Empty:
+                # Процес міг завершитись аварійно, не надіславши результат
+                for index in list(pending):
+                    if not self._processes[index].is_alive() and self._results.empty():
+                        crashed.add(index)
+                        pending.discard(index)
+                continue
+            stats[index].cpu_time = cpu_time
+            stats[index].latencies = latencies
+            stats[index].error = error
+            pending.discard(index)
+
+        for index, process in enumerate(self._processes):
+            process.join(timeout=0 if index in pending else None)
+            stats[index].exitcode = process.exitcode
+            stats[index].xvfb_cpu_time = self._cpu_time(self._xvfb[index].pid)
+            if index in crashed:
+                stats[index].error = f"Процес сесії завершився з кодом {process.exitcode}, не надіславши результат."
+            elif index in pending:
+                stats[index].cpu_time = self._cpu_time(process.pid)
+                stats[index].error = f"Сесія не завершилась за {timeout} с."
+        return [stats[index] for index in sorted(stats)]
+
+    def cpu_percent(self) -> Dict[int, float]:
+        """
+        Повертає поточне навантаження CPU для кожної живої сесії.
+
+        Перший виклик для сесії повертає 0.0, наступні — відсоток з моменту попереднього виклику.
+
+        Returns:
+            Dict[int, float]: Номер сесії -> відсоток CPU.
+        """
+        usage = {}
+        for index, process in enumerate(self._processes):
+            try:
+                if process.pid not in self._ps:
+                    self._ps[process.pid] = psutil.Process(process.pid)
+                usage[index] = self._ps[process.pid].cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, ValueError):
+                continue
+        return usage
+
+    def stop(self) -> None:
+        """Зупиняє сесії, віртуальні дисплеї та звільняє спільну пам'ять."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+        for xvfb in self._xvfb:
+            if xvfb.poll() is None:
+                xvfb.send_signal(signal.SIGTERM)
+                try:
+                    xvfb.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    xvfb.kill()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _reset(self) -> None:
+        """
+        Готує супервізор до нового запуску.
+
+        Raises:
+            RuntimeError: Якщо попередній запуск ще не зупинено через stop().
+        """
+        if (
+            self._shm is not None
+            or any(process.is_alive() for process in self._processes)
+            or any(xvfb.poll() is None for xvfb in self._xvfb)
+        ):
+            raise RuntimeError("Сесії вже запущено; викличте stop() перед повторним запуском.")
+
+        self._results = self._ctx.Queue()
+        self._manifest: TemplateManifest = {}
+        self._xvfb = []
+        self._processes = []
+        self._displays: List[str] = []
+        self._ps: Dict[int, psutil.Process] = {}
+
+    def _share_templates(self) -> None:
+        """
+        Завантажує шаблони у відтінках сірого, масштабує їх у всі масштаби з scales
+        і копіює все в один блок спільної пам'яті. Оригінальний масштаб 1.0 зберігається
+        завжди, щоб SessionContext.templates містив усі шаблони.
+        """
+        scales = set(self.searcher_kwargs["scales"] or []) | {1.0}
+        images = {}
+        for path in self.templates:
+            img_rgb = cv2.imread(path)
+            if img_rgb is None:
+                raise FileNotFoundError(f"Зображення {path} не знайдено.")
+            img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
+            for scale in sorted(scales):
+                scaled = scale_template(img_gray, scale)
+                if scaled is None:
+                    logger.warning(f"Масштаб {scale} для зображення {path} пропущено: розмір шаблону стає нульовим.")
+                    continue
+                images[(path, scale)] = scaled
+        if not images:
+            return
+
+        offset = 0
+        for key, image in images.items():
+            self._manifest[key] = (offset, image.shape)
+            offset += image.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=offset)
+        for key, image in images.items():
+            start, shape = self._manifest[key]
+            np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=start)[:] = image
+        logger.info(f"Шаблони ({len(images)}, {offset} байт) завантажено у спільну пам'ять {self._shm.name}")
+
+    @staticmethod
+    def _free_display(number: int) -> int:
+        """
+        Шукає вільний номер X-дисплея, починаючи з number.
+
+        Args:
+            number (int): Початковий номер дисплея.
+
+        Returns:
+            int: Номер дисплея, для якого немає lock-файлу.
+        """
+        while os.path.exists(f"/tmp/.X{number}-lock") or os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            number += 1
+        return number
+
+    def _start_xvfb(self, number: int) -> None:
+        """
+        Запускає Xvfb і чекає, поки дисплей почне приймати з'єднання.
+
+        Args:
+            number (int): Номер дисплея.
+
+        Raises:
+            RuntimeError: Якщо Xvfb завершився або не запустився за xvfb_timeout секунд.
+        """
+        width, height = self.screen_size
+        xvfb = subprocess.Popen(
+            [self.xvfb_cmd, f":{number}", "-screen", "0", f"{width}x{height}x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._xvfb.append(xvfb)
+
+        deadline = time.time() + self.xvfb_timeout
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            if xvfb.poll() is not None:
+                raise RuntimeError(f"Xvfb :{number} завершився з кодом {xvfb.returncode}.")
+            if time.time() > deadline:
+                raise RuntimeError(f"Xvfb :{number} не запустився за {self.xvfb_timeout} секунд.")
+            time.sleep(0.05)
+        logger.info(f"Віртуальний дисплей :{number} запущено (PID: {xvfb.pid})")
+
+    def _start_session(self, index: int, display: str) -> None:
+        """
+        Запускає процес сесії з DISPLAY, що вказує на її віртуальний дисплей.
+
+        Args:
+            index (int): Номер сесії.
+            display (str): Віртуальний дисплей сесії.
+        """
+        shm_name = self._shm.name if self._shm is not None else None
+        process = self._ctx.Process(
+            target=_run_session,
+            args=(self.target, index, display, shm_name, self._manifest, self.searcher_kwargs, self._results),
+            name=f"session-{index}",
+        )
+        # pyautogui читає DISPLAY під час імпорту, а дочірній процес успадковує оточення під час старту
+        with _start_lock:
+            previous = os.environ.get("DISPLAY")
+            os.environ["DISPLAY"] = display
+            try:
+                process.start()
+            finally:
+                if previous is None:
+                    os.environ.pop("DISPLAY", None)
+                else:
+                    os.environ["DISPLAY"] = previous
+        self._processes.append(process)
+        self._displays.append(display)
+        logger.info(f"Сесію {index} запущено на дисплеї {display} (PID: {process.pid})")
+
+    @staticmethod
+    def _cpu_time(pid: int) -> float:
+        """Повертає сумарний час CPU процесу та його дочірніх процесів або 0.0, якщо процес вже не існує."""
+        try:
+            return _cpu_seconds(psutil.Process(pid).cpu_times())
+        except psutil.NoSuchProcess:
+            return 0.0
+
+
+def _cpu_seconds(cpu: Any) -> float:
+    """
+    Підсумовує час CPU процесу разом із завершеними дочірніми процесами.
+
+    Args:
+        cpu (Any): Результат psutil.Process.cpu_times().
+
+    Returns:
+        float: user + system + children_user + children_system у секундах.
+    """
+    total = cpu.user + cpu.system + getattr(cpu, "children_user", 0.0) + getattr(cpu, "children_system", 0.0)
+    return round(total, 3)
+
+
+def _attach_templates(
+    shm_name: Optional[str],
+    manifest: TemplateManifest
+) -> Tuple[Optional[shared_memory.SharedMemory], Dict[str, np.ndarray], Dict[str, List[Tuple[float, np.ndarray]]]]:
+    """
+    Під'єднується до спільної пам'яті з шаблонами та створює масиви лише для читання без копіювання.
+
+    Args:
+        shm_name (Optional[str]): Ім'я блоку спільної пам'яті або None, якщо шаблонів немає.
+        manifest (TemplateManifest): Опис шаблонів у блоці.
+
+    Returns:
+        Tuple[Optional[shared_memory.SharedMemory], Dict[str, np.ndarray], Dict[str, List[Tuple[float, np.ndarray]]]]:
+        Блок пам'яті (його треба тримати відкритим, поки використовуються масиви), шаблони
+        в оригінальному масштабі та банк масштабованих шаблонів для ImageSearcher.
+    """
+    if shm_name is None:
+        return None, {}, {}
+
+    # Сесії використовують resource_tracker супервізора, тому блок видаляється лише в stop()
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    templates = {}
+    scale_bank: Dict[str, List[Tuple[float, np.ndarray]]] = {}
+    for (path, scale), (offset, shape) in manifest.items():
+        image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+        image.flags.writeable = False
+        if scale == 1:
+            templates[path] = image
+        scale_bank.setdefault(path, []).append((scale, image))
+    return shm, templates, scale_bank
+
+
+def _run_session(
+    target: Callable[[SessionContext], Any],
+    index: int,
+    display: str,
+    shm_name: Optional[str],
+    manifest: TemplateManifest,
+    searcher_kwargs: Dict[str, Any],
+    results: Any
+) -> None:
+    """Точка входу дочірнього процесу сесії."""
+    shm, templates, scale_bank = _attach_templates(shm_name, manifest)
+    shared_arrays = [weakref.ref(image) for bank in scale_bank.values() for _, image in bank]
+    context = SessionContext(index, display, templates, scale_bank, searcher_kwargs)
+    del templates, scale_bank
+    error = None
+    try:
+        target(context)
+    except Exception as e:
+        logger.error(f"Помилка в сесії {index}: {e}")
+        error = repr(e)
+    finally:
+        # Масиви посилаються на буфер спільної пам'яті, тому звільняємо їх перед закриттям
+        context.release_templates()
+        if shm is not None:
+            gc.collect()
+            kept = sum(ref() is not None for ref in shared_arrays)
+            try:
+                if kept:
+                    # numpy не завжди забороняє закриття буфера, а доступ до масиву після
+                    # закриття завершує процес аварійно, тому пам'ять звільнить ОС при виході
+                    raise BufferError(f"залишилось масивів: {kept}")
+                shm.close()
+            except BufferError as e:
+                message = f"Спільну пам'ять не закрито: функція сесії зберегла посилання на шаблони ({e})."
+                logger.error(f"Помилка в сесії {index}: {message}")
+                error = f"{error}; {message}" if error else message
+        results.put((index, _cpu_seconds(psutil.Process().cpu_times()), context.latency_summary(), error))
@@ -1,3 +1,4 @@
 from .kill_process_by_window_name import kill_process_by_window_name
 from .random_delay import random_delay
 from .send_telegram_message import send_telegram_message
+from .scale_template import scale_template
@@ -0,0 +1,25 @@
+import cv2
+import numpy as np
+from typing import Optional
+
+
+def scale_template(img_gray: np.ndarray, scale: float) -> Optional[np.ndarray]:
+    """
+    Масштабує шаблон для пошуку на екрані з іншою роздільною здатністю або DPI.
+
+    Args:
+        img_gray (np.ndarray): Шаблон у відтінках сірого.
+        scale (float): Масштаб.
+
+    Returns:
+        Optional[np.ndarray]: Масштабований шаблон або None, якщо в цьому масштабі
+        ширина чи висота шаблону стає нульовою.
+    """
+    if scale == 1:
+        return img_gray
+    height, width = img_gray.shape[:2]
+    size = (round(width * scale), round(height * scale))
+    if min(size) < 1:
+        return None
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    return cv2.resize(img_gray, size, interpolation=interpolation)
@@ -0,0 +1,40 @@
+from baseline import compare
+
+
+def _metric(median_ms, **extra):
+    return {"median_ms": median_ms, "p95_ms": median_ms, **extra}
+
+
+def test_within_tolerance_is_not_regression():
+    assert compare({"m": _metric(11.0)}, {"m": _metric(10.0)}, tolerance=0.2) == []
+
+
+def test_above_tolerance_but_below_min_delta_is_not_regression():
+    assert compare({"m": _metric(0.3)}, {"m": _metric(0.1)}, tolerance=0.2, min_delta_ms=0.5) == []
+
+
+def test_real_regression_is_reported():
+    regressions = compare({"m": _metric(15.0)}, {"m": _metric(10.0)}, tolerance=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("m:") and "+50.0%" in regressions[0]
+
+
+def test_metric_missing_from_current_run_is_reported():
+    regressions = compare({}, {"ocr.field": _metric(50.0)}, tolerance=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("ocr.field:")
+
+
+def test_zero_baseline_does_not_divide_by_zero():
+    assert len(compare({"m": _metric(5.0)}, {"m": _metric(0.0)}, tolerance=0.2)) == 1
+    assert compare({"m": _metric(0.0)}, {"m": _metric(0.0)}, tolerance=0.2) == []
+
+
+def test_accuracy_drop_is_reported():
+    baseline = {"ocr.field": _metric(50.0, accuracy=0.9)}
+
+    assert compare({"ocr.field": _metric(50.0, accuracy=0.89)}, baseline, tolerance=0.2) == []
+    regressions = compare({"ocr.field": _metric(50.0, accuracy=0.7)}, baseline, tolerance=0.2)
+    assert len(regressions) == 1 and "0.7" in regressions[0]
@@ -0,0 +1,120 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+try:
+    from effortless import ImageSearcher
+except Exception as e:  # pyautogui без дисплея падає вже під час імпорту
+    pytest.skip(f"effortless недоступний: {e}", allow_module_level=True)
+
+from synthetic import make_screen, make_template
+
+SCALES = [0.75, 1.0, 1.25, 1.5]
+DISPLAY = (":test", 1280, 720)
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = str(tmp_path / "template.png")
+    cv2.imwrite(path, make_template())
+    return path
+
+
+def _screen(scale):
+    return make_screen((1280, 720), make_template(), template_scale=scale)
+
+
+def _count_matches(monkeypatch):
+    calls = []
+    original = ImageSearcher._match_scale
+
+    def spy(candidate, screen_gray):
+        calls.append(candidate[0])
+        return original(candidate, screen_gray)
+
+    monkeypatch.setattr(ImageSearcher, "_match_scale", staticmethod(spy))
+    return calls
+
+
+def test_sweep_once_then_cached_scale(template_path, monkeypatch):
+    searcher = ImageSearcher(scales=SCALES)
+    bank = searcher._load_scale_bank(template_path)
+    screen = _screen(1.25)
+    calls = _count_matches(monkeypatch)
+
+    assert searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY) == screen.template_pos
+    assert sorted(calls) == SCALES
+    assert searcher._display_scales[DISPLAY] == 1.25
+
+    calls.clear()
+    assert searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY) == screen.template_pos
+    assert calls == [1.25]
+
+
+def test_cached_scale_is_not_swept_again_on_miss(template_path, monkeypatch):
+    searcher = ImageSearcher(scales=SCALES)
+    bank = searcher._load_scale_bank(template_path)
+    searcher._find_image_multiscale(bank, _screen(1.25).screen_gray, DISPLAY)
+    calls = _count_matches(monkeypatch)
+
+    assert searcher._find_image_multiscale(bank, _screen(1.5).screen_gray, DISPLAY) is None
+    assert calls == [1.25]
+
+
+def test_clear_scale_cache_forces_new_sweep(template_path, monkeypatch):
+    searcher = ImageSearcher(scales=SCALES)
+    bank = searcher._load_scale_bank(template_path)
+    searcher._find_image_multiscale(bank, _screen(1.25).screen_gray, DISPLAY)
+
+    searcher.clear_scale_cache()
+    calls = _count_matches(monkeypatch)
+    screen = _screen(1.5)
+
+    assert searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY) == screen.template_pos
+    assert sorted(calls) == SCALES
+    assert searcher._display_scales[DISPLAY] == 1.5
+
+
+def test_scale_with_empty_template_is_skipped(template_path):
+    searcher = ImageSearcher(scales=[0.01, 1.0])
+    bank = searcher._load_scale_bank(template_path)
+
+    assert [scale for scale, _ in bank] == [1.0]
+
+
+def test_cached_scale_missing_from_bank_falls_back_to_sweep(template_path):
+    searcher = ImageSearcher(scales=[0.01, 1.0])
+    bank = searcher._load_scale_bank(template_path)
+    searcher._display_scales[DISPLAY] = 0.01
+    screen = _screen(1.0)
+
+    assert searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY) == screen.template_pos
+
+
+def test_sequential_sweep_matches_parallel(template_path):
+    screen = _screen(1.25)
+    found = []
+    for max_workers in (1, len(SCALES)):
+        with ImageSearcher(scales=SCALES, max_workers=max_workers) as searcher:
+            bank = searcher._load_scale_bank(template_path)
+            found.append(searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY))
+            assert searcher._display_scales[DISPLAY] == 1.25
+            if max_workers == 1:
+                assert searcher._executor is None
+
+    assert found == [screen.template_pos, screen.template_pos]
+
+
+def test_close_shuts_down_executor(template_path):
+    searcher = ImageSearcher(scales=SCALES, max_workers=len(SCALES))
+    bank = searcher._load_scale_bank(template_path)
+    screen = _screen(1.25)
+    searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY)
+    executor = searcher._executor
+
+    searcher.close()
+
+    assert searcher._executor is None
+    assert executor._shutdown
+    searcher.clear_scale_cache()
+    assert searcher._find_image_multiscale(bank, screen.screen_gray, DISPLAY) == screen.template_pos
+    searcher.close()
@@ -0,0 +1,212 @@
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from effortless import SessionSupervisor  # noqa: E402
+from effortless.session_runner import _attach_templates  # noqa: E402
+from synthetic import make_template  # noqa: E402
+
+FIRST_DISPLAY = 150
+
+FAKE_XVFB = """#!{python}
+import os
+import signal
+import sys
+import time
+
+path = "/tmp/.X11-unix/X" + sys.argv[1].lstrip(":")
+os.makedirs("/tmp/.X11-unix", exist_ok=True)
+open(path, "w").close()
+
+
+def stop(*_):
+    os.remove(path)
+    sys.exit(0)
+
+
+signal.signal(signal.SIGTERM, stop)
+while True:
+    time.sleep(0.1)
+"""
+
+# Посилання, яке функція сесії навмисно залишає на шаблон у спільній пам'яті
+_KEPT = []
+
+
+def report_ok(ctx):
+    assert "pyautogui" not in sys.modules
+    assert os.environ["DISPLAY"] == ctx.display
+    with ctx.timed("noop"):
+        pass
+
+
+def report_error(ctx):
+    raise ValueError("boom")
+
+
+def crash(ctx):
+    os._exit(3)
+
+
+def hang(ctx):
+    while True:
+        sum(range(10 ** 5))
+
+
+def keep_template(ctx):
+    _KEPT.extend(ctx.templates.values())
+
+
+def check_templates_without_scale_one(ctx):
+    (image,) = ctx.templates.values()
+    assert image.shape == (48, 64) and not image.flags.writeable
+    (bank,) = ctx.scale_bank.values()
+    assert {0.75, 1.25} <= {scale for scale, _ in bank}
+
+
+def report_display(ctx):
+    import pyautogui
+
+    assert os.environ["DISPLAY"] == ctx.display
+    with ctx.timed("size"):
+        assert tuple(pyautogui.size()) == (640, 480)
+    assert ctx.templates and not any(t.flags.writeable for t in ctx.templates.values())
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = str(tmp_path / "template.png")
+    cv2.imwrite(path, make_template())
+    return path
+
+
+@pytest.fixture
+def fake_xvfb(tmp_path):
+    """Замість Xvfb — скрипт, який лише створює сокет дисплея і чекає на SIGTERM."""
+    path = tmp_path / "Xvfb"
+    path.write_text(FAKE_XVFB.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+def _run(target, sessions, fake_xvfb, timeout=60, **kwargs):
+    supervisor = SessionSupervisor(target, sessions, xvfb_cmd=fake_xvfb, first_display=FIRST_DISPLAY, **kwargs)
+    supervisor.start()
+    try:
+        return supervisor.join(timeout=timeout)
+    finally:
+        supervisor.stop()
+
+
+def test_shared_templates_round_trip(template_path):
+    supervisor = SessionSupervisor(report_ok, 1, templates=[template_path], scales=[1.0, 1.5])
+    supervisor._share_templates()
+    try:
+        shm, templates, scale_bank = _attach_templates(supervisor._shm.name, supervisor._manifest)
+        original = cv2.cvtColor(cv2.imread(template_path), cv2.COLOR_BGR2GRAY)
+
+        assert (templates[template_path] == original).all()
+        assert [scale for scale, _ in scale_bank[template_path]] == [1.0, 1.5]
+        scaled = dict(scale_bank[template_path])[1.5]
+        assert scaled.shape == (round(original.shape[0] * 1.5), round(original.shape[1] * 1.5))
+        for _, image in scale_bank[template_path]:
+            assert not image.flags.writeable
+            with pytest.raises(ValueError):
+                image[0, 0] = 0
+
+        del templates, scale_bank, scaled, image
+        shm.close()
+    finally:
+        supervisor.stop()
+
+
+def test_import_and_run_without_display(fake_xvfb):
+    code = (
+        "import sys\n"
+        "from effortless import SessionSupervisor\n"
+        "from test_session_runner import report_ok\n"
+        "assert 'pyautogui' not in sys.modules\n"
+        f"stats = SessionSupervisor(report_ok, 2, xvfb_cmd={fake_xvfb!r}, first_display={FIRST_DISPLAY}).run()\n"
+        "assert 'pyautogui' not in sys.modules\n"
+        "assert [s.error for s in stats] == [None, None], stats\n"
+        "assert len({s.display for s in stats}) == 2, stats\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "DISPLAY"}
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=120)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_error_is_reported_in_stats(fake_xvfb):
+    stats = _run(report_error, 2, fake_xvfb)
+
+    assert [s.error for s in stats] == ["ValueError('boom')"] * 2
+    assert all(s.exitcode == 0 for s in stats)
+
+
+def test_join_handles_crashed_session(fake_xvfb):
+    stats = _run(crash, 1, fake_xvfb)
+
+    assert stats[0].exitcode == 3
+    assert "3" in stats[0].error
+    assert stats[0].latencies == {}
+
+
+def test_join_timeout_is_reported(fake_xvfb):
+    supervisor = SessionSupervisor(hang, 1, xvfb_cmd=fake_xvfb, first_display=FIRST_DISPLAY)
+    supervisor.start()
+    try:
+        time.sleep(1)
+        stats = supervisor.join(timeout=1)
+    finally:
+        supervisor.stop()
+
+    assert stats[0].exitcode is None
+    assert "не завершилась" in stats[0].error
+    assert stats[0].cpu_time > 0
+
+
+def test_kept_template_reference_is_reported(fake_xvfb, template_path):
+    stats = _run(keep_template, 1, fake_xvfb, templates=[template_path])
+
+    assert "посилання на шаблони" in stats[0].error
+    assert stats[0].exitcode == 0
+
+
+def test_templates_are_shared_without_scale_one(fake_xvfb, template_path):
+    stats = _run(check_templates_without_scale_one, 1, fake_xvfb, templates=[template_path], scales=[0.75, 1.25])
+
+    assert stats[0].error is None
+
+
+def test_restart_requires_stop_and_resets_state(fake_xvfb):
+    supervisor = SessionSupervisor(report_ok, 2, xvfb_cmd=fake_xvfb, first_display=FIRST_DISPLAY)
+    supervisor.start()
+    supervisor.join(timeout=60)
+    with pytest.raises(RuntimeError):
+        supervisor.start()
+    supervisor.stop()
+
+    stats = supervisor.run()
+
+    assert [s.index for s in stats] == [0, 1]
+    assert all(s.error is None and s.latencies["noop"]["count"] == 1 for s in stats)
+
+
+@pytest.mark.skipif(shutil.which("Xvfb") is None, reason="Xvfb не встановлено")
+@pytest.mark.skipif(importlib.util.find_spec("pyautogui") is None, reason="pyautogui не встановлено")
+def test_sessions_run_on_own_xvfb_displays(template_path):
+    supervisor = SessionSupervisor(report_display, 2, templates=[template_path], screen_size=(640, 480))
+
+    stats = supervisor.run()
+
+    assert len({s.display for s in stats}) == 2
+    assert all(s.error is None and s.latencies["size"]["count"] == 1 for s in stats)